@@ -1,19 +1,94 @@
-from django.contrib import admin
+from functools import partial
+import json
+import logging
+
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import ChangeList
+from django.db import connections, transaction
+from django.db.models import Count
 from django.utils.html import format_html
+from kombu.exceptions import OperationalError
 from .models import ReaderProfile, Product, VirtualGift
-import requests
-import os
+from .paginators import EstimatedCountPaginator
+from .tasks import BACKEND_SYNC_FIELDS, SYNC_BATCH_SIZE, create_stripe_product, sync_readers_to_backend
+
+logger = logging.getLogger(__name__)
+
+STATUS_COLORS = {
+    'online': 'green',
+    'offline': 'gray',
+    'busy': 'orange'
+}
+
+STATUS_BADGE_TEMPLATE = '<span style="background-color: {}; color: white; padding: 3px 10px; border-radius: 3px;">{}</span>'
+
+# Status values are fixed choices, so each badge is escaped and rendered
+# once at import; rows only do a dict lookup.
+STATUS_BADGES = {
+    status: format_html(STATUS_BADGE_TEMPLATE, STATUS_COLORS.get(status, 'gray'), status.upper())
+    for status, label in ReaderProfile.STATUS_CHOICES
+}
+
+
+def queue_task(task, *args):
+    """Queue a Celery task, logging broker outages instead of failing the request"""
+    try:
+        task.delay(*args)
+    except OperationalError:
+        logger.exception("Could not queue %s%r", task.name, args)
+        return False
+    return True
+
+
+class SpecialtyListFilter(admin.SimpleListFilter):
+    """Filter readers by specialty using JSON containment (GIN indexed)"""
+    title = 'specialty'
+    parameter_name = 'specialty'
+    
+    def lookups(self, request, model_admin):
+        return ReaderProfile.SPECIALTY_CHOICES
+    
+    def queryset(self, request, queryset):
+        if not self.value():
+            return queryset
+        if connections[queryset.db].vendor == 'postgresql':
+            return queryset.filter(specialties__contains=[self.value()])
+        # Other backends lack JSON containment; match the quoted list item in the stored JSON text
+        return queryset.filter(specialties__icontains=json.dumps(self.value()))
+
+
+class ModelAdminEstimateCountMixin:
+    """Avoid COUNT(*) on unfiltered changelists by using the table estimate"""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class DeferredFieldsChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        qs = super().get_queryset(request, exclude_parameters)
+        return qs.defer(*self.model_admin.changelist_defer)
+
+
+class ChangeListDeferMixin:
+    """Skip loading large columns the changelist never displays"""
+    changelist_defer = ()
+    
+    def get_changelist(self, request, **kwargs):
+        return DeferredFieldsChangeList
+
 
 @admin.register(ReaderProfile)
-class ReaderProfileAdmin(admin.ModelAdmin):
-    list_display = ['display_name', 'email', 'status_badge', 'average_rating', 'total_earnings', 'pending_payout', 'created_at']
-    list_filter = ['status', 'is_active', 'created_at']
+class ReaderProfileAdmin(ModelAdminEstimateCountMixin, ChangeListDeferMixin, admin.ModelAdmin):
+    list_display = ['display_name', 'email', 'status_badge', 'products_count', 'average_rating', 'total_earnings', 'pending_payout', 'created_at']
+    list_filter = ['status', SpecialtyListFilter, 'is_active', 'created_at']
     search_fields = ['display_name', 'email', 'clerk_id']
-    readonly_fields = ['clerk_id', 'total_earnings', 'pending_payout', 'average_rating', 'total_reviews', 'created_at', 'updated_at']
+    changelist_defer = ['bio']
+    actions = ['sync_selected_to_backend']
+    readonly_fields = ['clerk_id', 'profile_picture_preview', 'total_earnings', 'pending_payout', 'average_rating', 'total_reviews', 'created_at', 'updated_at']
     
     fieldsets = (
         ('Basic Information', {
-            'fields': ('clerk_id', 'email', 'display_name', 'bio', 'profile_picture')
+            'fields': ('clerk_id', 'email', 'display_name', 'bio', 'profile_picture', 'profile_picture_preview')
         }),
         ('Specialties & Services', {
             'fields': ('specialties',)
@@ -35,52 +110,71 @@ class ReaderProfileAdmin(admin.ModelAdmin):
         }),
     )
     
+    def get_queryset(self, request):
+        qs = super().get_queryset(request)
+        return qs.annotate(products_count=Count('products'))
+    
+    def products_count(self, obj):
+        return obj.products_count
+    products_count.short_description = 'Products'
+    products_count.admin_order_field = 'products_count'
+    
+    def profile_picture_preview(self, obj):
+        if not obj.profile_picture:
+            return '-'
+        try:
+            url = obj.thumbnail.url
+        except (OSError, ValueError):
+            # Source upload missing or unreadable; don't take down the change form
+            return '-'
+        return format_html('<img src="{}" width="64" height="64" alt="">', url)
+    profile_picture_preview.short_description = 'Preview'
+    
     def status_badge(self, obj):
-        colors = {
-            'online': 'green',
-            'offline': 'gray',
-            'busy': 'orange'
-        }
-        return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 10px; border-radius: 3px;">{}</span>',
-            colors.get(obj.status, 'gray'),
-            obj.status.upper()
-        )
+        badge = STATUS_BADGES.get(obj.status)
+        if badge is None:
+            badge = format_html(STATUS_BADGE_TEMPLATE, 'gray', obj.status.upper())
+        return badge
     status_badge.short_description = 'Status'
     
+    @admin.action(description='Sync selected readers to backend')
+    def sync_selected_to_backend(self, request, queryset):
+        reader_ids = list(queryset.values_list('pk', flat=True))
+        # One task per batch so a large selection never becomes one huge request
+        queued = 0
+        for start in range(0, len(reader_ids), SYNC_BATCH_SIZE):
+            batch = reader_ids[start:start + SYNC_BATCH_SIZE]
+            if not queue_task(sync_readers_to_backend, batch):
+                break
+            queued += len(batch)
+        if queued < len(reader_ids):
+            self.message_user(
+                request,
+                f"Could not queue the backend sync for {len(reader_ids) - queued} of {len(reader_ids)} reader(s); try again later.",
+                messages.ERROR,
+            )
+            return
+        self.message_user(request, f"Queued {len(reader_ids)} reader(s) for backend sync.")
+    
     def save_model(self, request, obj, form, change):
-        """Sync reader profile with Node.js backend"""
+        """Queue the reader profile sync with the Node.js backend"""
         super().save_model(request, obj, form, change)
         
-        # Sync with backend API
-        backend_url = os.getenv('BACKEND_API_URL', 'http://localhost:5000')
-        try:
-            if not change:  # New reader
-                # Create user in backend
-                response = requests.post(
-                    f'{backend_url}/api/admin/readers',
-                    json={
-                        'clerk_id': obj.clerk_id,
-                        'email': obj.email,
-                        'display_name': obj.display_name,
-                        'bio': obj.bio,
-                        'specialties': obj.specialties,
-                        'chat_rate': float(obj.chat_rate),
-                        'call_rate': float(obj.call_rate),
-                        'video_rate': float(obj.video_rate),
-                    }
-                )
-                if response.status_code == 201:
-                    print(f"Reader {obj.display_name} synced with backend")
-        except Exception as e:
-            print(f"Error syncing reader with backend: {e}")
+        # Edits that leave every mirrored field alone have nothing to sync
+        if change and not set(form.changed_data) & set(BACKEND_SYNC_FIELDS):
+            return
+        
+        # Dispatch once the admin transaction commits so the worker sees the row
+        transaction.on_commit(partial(queue_task, sync_readers_to_backend, [obj.pk]))
 
 
 @admin.register(Product)
-class ProductAdmin(admin.ModelAdmin):
+class ProductAdmin(ModelAdminEstimateCountMixin, ChangeListDeferMixin, admin.ModelAdmin):
     list_display = ['name', 'product_type', 'price', 'reader', 'inventory_count', 'is_active', 'created_at']
     list_filter = ['product_type', 'is_active', 'created_at']
+    list_select_related = ['reader']
     search_fields = ['name', 'description', 'stripe_product_id']
+    changelist_defer = ['description', 'images', 'metadata', 'reader__bio']
     readonly_fields = ['stripe_product_id', 'created_at', 'updated_at']
     
     fieldsets = (
@@ -105,34 +199,15 @@ class ProductAdmin(admin.ModelAdmin):
     )
     
     def save_model(self, request, obj, form, change):
-        """Sync product with Stripe"""
-        import stripe
-        stripe.api_key = os.getenv('STRIPE_SECRET_KEY')
-        
-        try:
-            if not obj.stripe_product_id:
-                # Create product in Stripe
-                product = stripe.Product.create(
-                    name=obj.name,
-                    description=obj.description,
-                )
-                
-                # Create price
-                price = stripe.Price.create(
-                    product=product.id,
-                    unit_amount=int(obj.price * 100),
-                    currency='usd',
-                )
-                
-                obj.stripe_product_id = product.id
-        except Exception as e:
-            print(f"Error syncing with Stripe: {e}")
-        
+        """Queue the product sync with Stripe"""
         super().save_model(request, obj, form, change)
+        
+        if not obj.stripe_product_id:
+            transaction.on_commit(partial(queue_task, create_stripe_product, obj.pk))
 
 
 @admin.register(VirtualGift)
-class VirtualGiftAdmin(admin.ModelAdmin):
+class VirtualGiftAdmin(ModelAdminEstimateCountMixin, admin.ModelAdmin):
     list_display = ['name', 'price', 'is_active', 'created_at']
     list_filter = ['is_active', 'created_at']
     search_fields = ['name', 'description']
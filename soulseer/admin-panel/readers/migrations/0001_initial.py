@@ -0,0 +1,88 @@
+# Generated by Django 5.1.15 on 2026-10-15 18:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VirtualGift',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('icon_url', models.URLField(blank=True)),
+                ('animation_url', models.URLField(blank=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Virtual Gift',
+                'verbose_name_plural': 'Virtual Gifts',
+                'ordering': ['price'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ReaderProfile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('clerk_id', models.CharField(max_length=255, unique=True)),
+                ('email', models.EmailField(max_length=254, unique=True)),
+                ('display_name', models.CharField(max_length=255)),
+                ('bio', models.TextField(blank=True)),
+                ('profile_picture', models.ImageField(blank=True, null=True, upload_to='reader_profiles/')),
+                ('specialties', models.JSONField(default=list)),
+                ('chat_rate', models.DecimalField(decimal_places=2, default=2.99, max_digits=10)),
+                ('call_rate', models.DecimalField(decimal_places=2, default=3.99, max_digits=10)),
+                ('video_rate', models.DecimalField(decimal_places=2, default=4.99, max_digits=10)),
+                ('status', models.CharField(choices=[('online', 'Online'), ('offline', 'Offline'), ('busy', 'Busy')], default='offline', max_length=20)),
+                ('is_online', models.BooleanField(default=False)),
+                ('is_active', models.BooleanField(default=True)),
+                ('total_earnings', models.DecimalField(decimal_places=2, default=0.0, max_digits=10)),
+                ('pending_payout', models.DecimalField(decimal_places=2, default=0.0, max_digits=10)),
+                ('stripe_account_id', models.CharField(blank=True, max_length=255)),
+                ('average_rating', models.DecimalField(decimal_places=2, default=0.0, max_digits=3)),
+                ('total_reviews', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Reader Profile',
+                'verbose_name_plural': 'Reader Profiles',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'is_active'], name='readers_rea_status_c2dae4_idx'), models.Index(fields=['-created_at'], name='readers_rea_created_cce257_idx'), models.Index(fields=['is_online', 'status'], name='readers_rea_is_onli_9c26c7_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='Product',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stripe_product_id', models.CharField(blank=True, max_length=255, null=True, unique=True)),
+                ('name', models.CharField(max_length=255)),
+                ('description', models.TextField()),
+                ('product_type', models.CharField(choices=[('service', 'Service'), ('digital', 'Digital Product'), ('physical', 'Physical Product')], max_length=50)),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('inventory_count', models.IntegerField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('images', models.JSONField(default=list)),
+                ('metadata', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('reader', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='products', to='readers.readerprofile')),
+            ],
+            options={
+                'verbose_name': 'Product',
+                'verbose_name_plural': 'Products',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['product_type', 'is_active'], name='readers_pro_product_75eaea_idx'), models.Index(fields=['reader', 'is_active'], name='readers_pro_reader__7e5ef2_idx'), models.Index(fields=['-created_at'], name='readers_pro_created_6deb43_idx')],
+            },
+        ),
+    ]
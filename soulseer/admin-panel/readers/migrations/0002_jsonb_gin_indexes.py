@@ -0,0 +1,26 @@
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+import readers.operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('readers', '0001_initial'),
+    ]
+
+    operations = [
+        readers.operations.PostgresAddIndex(
+            model_name='readerprofile',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['specialties'], name='readers_rea_special_87487c_gin'),
+        ),
+        readers.operations.PostgresAddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['images'], name='readers_pro_images_ddad74_gin'),
+        ),
+        readers.operations.PostgresAddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['metadata'], name='readers_pro_metadat_1f474d_gin'),
+        ),
+    ]
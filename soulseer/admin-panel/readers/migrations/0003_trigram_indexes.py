@@ -0,0 +1,37 @@
+import django.contrib.postgres.indexes
+import django.contrib.postgres.operations
+import django.db.models.functions.text
+from django.db import migrations
+
+import readers.operations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('readers', '0002_jsonb_gin_indexes'),
+    ]
+
+    operations = [
+        django.contrib.postgres.operations.TrigramExtension(),
+        readers.operations.PostgresAddIndex(
+            model_name='readerprofile',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('display_name'), name='gin_trgm_ops'), name='reader_dn_trgm'),
+        ),
+        readers.operations.PostgresAddIndex(
+            model_name='readerprofile',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='gin_trgm_ops'), name='reader_email_trgm'),
+        ),
+        readers.operations.PostgresAddIndex(
+            model_name='readerprofile',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('clerk_id'), name='gin_trgm_ops'), name='reader_clerk_trgm'),
+        ),
+        readers.operations.PostgresAddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='product_name_trgm'),
+        ),
+        readers.operations.PostgresAddIndex(
+            model_name='product',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('description'), name='gin_trgm_ops'), name='product_desc_trgm'),
+        ),
+    ]
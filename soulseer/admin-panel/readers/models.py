@@ -1,5 +1,9 @@
 from django.db import models
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db.models.functions import Upper
 from django.contrib.auth.models import User
+from imagekit.models import ImageSpecField
+from imagekit.processors import ResizeToFill
 
 class ReaderProfile(models.Model):
     """Reader profile model for admin management"""
@@ -10,6 +14,12 @@ class ReaderProfile(models.Model):
     display_name = models.CharField(max_length=255)
     bio = models.TextField(blank=True)
     profile_picture = models.ImageField(upload_to='reader_profiles/', blank=True, null=True)
+    thumbnail = ImageSpecField(
+        source='profile_picture',
+        processors=[ResizeToFill(64, 64)],
+        format='WEBP',
+        options={'quality': 75},
+    )
     
     # Specialties
     SPECIALTY_CHOICES = [
@@ -58,6 +68,16 @@ class ReaderProfile(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Reader Profile'
         verbose_name_plural = 'Reader Profiles'
+        indexes = [
+            models.Index(fields=['status', 'is_active']),
+            models.Index(fields=['-created_at']),
+            models.Index(fields=['is_online', 'status']),
+            GinIndex(fields=['specialties']),
+            # Trigram indexes for admin search, which filters on UPPER(col) LIKE '%term%'
+            GinIndex(OpClass(Upper('display_name'), name='gin_trgm_ops'), name='reader_dn_trgm'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='reader_email_trgm'),
+            GinIndex(OpClass(Upper('clerk_id'), name='gin_trgm_ops'), name='reader_clerk_trgm'),
+        ]
     
     def __str__(self):
         return f"{self.display_name} ({self.email})"
@@ -72,7 +92,8 @@ class Product(models.Model):
         ('physical', 'Physical Product'),
     ]
     
-    stripe_product_id = models.CharField(max_length=255, unique=True, blank=True)
+    # Null until the Stripe sync task fills it in, so unsynced products don't collide on unique
+    stripe_product_id = models.CharField(max_length=255, unique=True, blank=True, null=True)
     name = models.CharField(max_length=255)
     description = models.TextField()
     product_type = models.CharField(max_length=50, choices=PRODUCT_TYPE_CHOICES)
@@ -90,6 +111,15 @@ class Product(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Product'
         verbose_name_plural = 'Products'
+        indexes = [
+            models.Index(fields=['product_type', 'is_active']),
+            models.Index(fields=['reader', 'is_active']),
+            models.Index(fields=['-created_at']),
+            GinIndex(fields=['images']),
+            GinIndex(fields=['metadata']),
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='product_name_trgm'),
+            GinIndex(OpClass(Upper('description'), name='gin_trgm_ops'), name='product_desc_trgm'),
+        ]
     
     def __str__(self):
         return self.name
@@ -0,0 +1,13 @@
+from django.db import migrations
+
+
+class PostgresAddIndex(migrations.AddIndex):
+    """AddIndex for PostgreSQL-only index types; a no-op on other databases"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'postgresql':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
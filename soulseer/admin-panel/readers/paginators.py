@@ -0,0 +1,29 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that uses PostgreSQL's planner estimate for unfiltered counts"""
+
+    # The count also bounds page slicing, so a stale low estimate would hide
+    # the newest rows; below this size an exact COUNT(*) is cheap anyway.
+    estimate_threshold = 10_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        connection = connections[queryset.db]
+        if connection.vendor == 'postgresql' and not queryset.query.where:
+            with connection.cursor() as cursor:
+                # Resolve the table through regclass so the search_path picks
+                # exactly one relation, even if another schema has the same name
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [connection.ops.quote_name(queryset.model._meta.db_table)],
+                )
+                row = cursor.fetchone()
+            # reltuples is -1 until the table has been analyzed
+            if row and row[0] > self.estimate_threshold:
+                return row[0]
+        return super().count
@@ -0,0 +1,128 @@
+from celery import shared_task
+from decimal import Decimal
+import hashlib
+import httpx
+import logging
+import orjson
+import stripe
+import os
+
+from .models import ReaderProfile, Product
+
+logger = logging.getLogger(__name__)
+
+BACKEND_URL = os.getenv('BACKEND_API_URL', 'http://localhost:5000')
+STRIPE_KEY = os.getenv('STRIPE_SECRET_KEY')
+ADMIN_SYNC_SECRET = os.getenv('ADMIN_SYNC_SECRET', '')
+
+# ReaderProfile fields mirrored in the Node.js backend
+BACKEND_SYNC_FIELDS = (
+    'clerk_id', 'email', 'display_name', 'bio', 'specialties',
+    'chat_rate', 'call_rate', 'video_rate',
+)
+
+# Shared HTTP/2 client for the Node.js backend so sync tasks multiplex
+# requests over pooled keep-alive connections.
+_CLIENT = httpx.Client(
+    timeout=httpx.Timeout(10.0, connect=3.0),
+    transport=httpx.HTTPTransport(
+        http2=True,
+        retries=3,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+    ),
+)
+
+# Readers per bulk sync request; keeps each body under the backend's
+# parser limit and each request well inside the read timeout
+SYNC_BATCH_SIZE = 50
+
+# Gateway errors from the backend are transient and worth retrying
+RETRY_STATUS_CODES = {502, 503, 504}
+
+stripe.api_key = STRIPE_KEY
+
+# Reuse one pooled session for every Stripe API call instead of letting
+# stripe-python build its client lazily; Stripe's own network retries are
+# safe because product and price creation send idempotency keys.
+stripe.default_http_client = stripe.RequestsClient(timeout=30, verify_ssl_certs=True)
+stripe.max_network_retries = 2
+
+
+def _json_default(value):
+    # Emit Decimals as exact JSON numbers rather than rounding through float
+    if isinstance(value, Decimal):
+        return orjson.Fragment(str(value))
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+@shared_task(bind=True, autoretry_for=(httpx.TransportError,), retry_backoff=True, max_retries=5)
+def sync_readers_to_backend(self, reader_ids):
+    """Upsert a batch of reader accounts in the Node.js backend with one request"""
+    readers = ReaderProfile.objects.only(*BACKEND_SYNC_FIELDS).filter(pk__in=reader_ids)
+    payload = [{field: getattr(obj, field) for field in BACKEND_SYNC_FIELDS} for obj in readers]
+    pk_by_clerk_id = {obj.clerk_id: obj.pk for obj in readers}
+    if not payload:
+        return
+
+    # The backend upserts each reader, so retrying the whole batch is safe.
+    # New readers get a Stripe Connect account, hence the longer read timeout.
+    response = _CLIENT.post(
+        f'{BACKEND_URL}/api/admin/readers/bulk',
+        content=orjson.dumps({'readers': payload}, default=_json_default),
+        headers={'Content-Type': 'application/json', 'X-Admin-Sync-Secret': ADMIN_SYNC_SECRET},
+        timeout=httpx.Timeout(60.0, connect=3.0),
+    )
+    if response.status_code in RETRY_STATUS_CODES:
+        raise self.retry(countdown=2 ** self.request.retries)
+    if response.status_code != 200:
+        logger.error("Error syncing %s readers with backend: HTTP %s", len(payload), response.status_code)
+        return
+
+    # Retry only the readers that failed for a transient reason
+    retry_ids = []
+    for result in orjson.loads(response.content)['results']:
+        if result['success']:
+            logger.info("Reader %s synced with backend", result['clerk_id'])
+        elif result.get('retryable'):
+            logger.warning("Error syncing reader %s with backend, will retry", result['clerk_id'])
+            retry_ids.append(pk_by_clerk_id[result['clerk_id']])
+        else:
+            logger.error("Error syncing reader %s with backend", result['clerk_id'])
+    if retry_ids:
+        raise self.retry(args=[retry_ids], countdown=2 ** self.request.retries)
+
+
+@shared_task(
+    bind=True,
+    autoretry_for=(stripe.error.APIConnectionError, stripe.error.RateLimitError, stripe.error.APIError),
+    retry_backoff=True,
+    max_retries=5,
+)
+def create_stripe_product(self, product_id):
+    """Create the Stripe product and price for a shop product"""
+    try:
+        obj = Product.objects.get(pk=product_id)
+    except Product.DoesNotExist:
+        return
+    if obj.stripe_product_id:
+        return
+
+    # Idempotency keys make retries and repeated saves return the objects
+    # Stripe already created instead of duplicating them.
+    digest = hashlib.sha256(f'{obj.name}\0{obj.description}'.encode()).hexdigest()[:16]
+    unit_amount = int(obj.price * 100)
+
+    product = stripe.Product.create(
+        name=obj.name,
+        description=obj.description,
+        idempotency_key=f'prod-{obj.pk}-{digest}',
+    )
+    stripe.Price.create(
+        product=product.id,
+        unit_amount=unit_amount,
+        currency='usd',
+        idempotency_key=f'price-{obj.pk}-{digest}-{unit_amount}',
+    )
+
+    Product.objects.filter(pk=obj.pk).update(stripe_product_id=product.id)
+    logger.info("Product %s synced with Stripe as %s", obj.pk, product.id)
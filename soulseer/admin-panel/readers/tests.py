@@ -1,3 +1,326 @@
-from django.test import TestCase
+from decimal import Decimal
+from io import BytesIO
+import os
+import re
+import shutil
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+import httpx
+import orjson
+from PIL import Image
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from kombu.exceptions import OperationalError
+
+from .models import Product, ReaderProfile
+from .paginators import EstimatedCountPaginator
+from .tasks import _json_default, sync_readers_to_backend
+
+
+class ReaderProfileAdminTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        cls.reader = ReaderProfile.objects.create(
+            clerk_id='clerk_1',
+            email='reader@example.com',
+            display_name='Reader',
+            specialties=['tarot'],
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin_user)
+
+    def change_reader(self, **changes):
+        data = {
+            'email': self.reader.email,
+            'display_name': self.reader.display_name,
+            'bio': self.reader.bio,
+            'specialties': '["tarot"]',
+            # Rendered by the admin for fields with a callable default
+            'initial-specialties': '["tarot"]',
+            'chat_rate': self.reader.chat_rate,
+            'call_rate': self.reader.call_rate,
+            'video_rate': self.reader.video_rate,
+            'status': self.reader.status,
+            'is_active': 'on',
+            'stripe_account_id': '',
+        }
+        data.update(changes)
+        return self.client.post(f'/admin/readers/readerprofile/{self.reader.pk}/change/', data)
+
+    def test_change_form_renders_with_missing_profile_picture(self):
+        ReaderProfile.objects.filter(pk=self.reader.pk).update(profile_picture='reader_profiles/missing.jpg')
+        response = self.client.get(f'/admin/readers/readerprofile/{self.reader.pk}/change/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_change_form_previews_profile_picture_thumbnail(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        image = BytesIO()
+        Image.new('RGB', (200, 200), 'purple').save(image, 'JPEG')
+
+        with override_settings(MEDIA_ROOT=media_root):
+            self.reader.profile_picture.save('portrait.jpg', SimpleUploadedFile('portrait.jpg', image.getvalue()))
+            response = self.client.get(f'/admin/readers/readerprofile/{self.reader.pk}/change/')
+            self.assertEqual(response.status_code, 200)
+            src = re.search(r'<img src="([^"]+\.webp)"', response.content.decode()).group(1)
+            self.assertTrue(src.startswith(settings.MEDIA_URL))
+            self.assertTrue(os.path.isfile(os.path.join(media_root, src.removeprefix(settings.MEDIA_URL))))
+
+    @mock.patch('readers.admin.sync_readers_to_backend')
+    def test_sync_action_reports_broker_outage(self, sync_readers_to_backend):
+        sync_readers_to_backend.delay.side_effect = OperationalError('broker unavailable')
+        with self.assertLogs('readers.admin', 'ERROR'):
+            response = self.client.post('/admin/readers/readerprofile/', {
+                'action': 'sync_selected_to_backend',
+                '_selected_action': [self.reader.pk],
+            }, follow=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Could not queue the backend sync')
+
+    @mock.patch('readers.admin.sync_readers_to_backend')
+    def test_sync_action_queues_one_task_per_batch(self, sync_readers_to_backend):
+        ReaderProfile.objects.bulk_create(
+            ReaderProfile(clerk_id=f'clerk_bulk_{i}', email=f'bulk{i}@example.com', display_name=f'Bulk {i}')
+            for i in range(119)
+        )
+        reader_ids = list(ReaderProfile.objects.values_list('pk', flat=True))
+        response = self.client.post('/admin/readers/readerprofile/', {
+            'action': 'sync_selected_to_backend',
+            '_selected_action': reader_ids,
+        }, follow=True)
+        self.assertContains(response, 'Queued 120 reader(s) for backend sync.')
+        batches = [c.args[0] for c in sync_readers_to_backend.delay.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [50, 50, 20])
+        self.assertEqual(sorted(sum(batches, [])), sorted(reader_ids))
+
+    def test_specialty_filter(self):
+        ReaderProfile.objects.create(
+            clerk_id='clerk_2',
+            email='astrologer@example.com',
+            display_name='Astrologer',
+            specialties=['astrology', 'numerology'],
+        )
+        response = self.client.get('/admin/readers/readerprofile/', {'specialty': 'tarot'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['cl'].result_list), [self.reader])
+
+        response = self.client.get('/admin/readers/readerprofile/', {'specialty': 'numerology'})
+        self.assertEqual([r.display_name for r in response.context['cl'].result_list], ['Astrologer'])
+
+    @mock.patch('readers.admin.sync_readers_to_backend')
+    def test_edit_without_synced_fields_skips_backend(self, sync_readers_to_backend):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.change_reader(status='busy')
+        self.assertEqual(response.status_code, 302)
+        sync_readers_to_backend.delay.assert_not_called()
+
+    @mock.patch('readers.admin.sync_readers_to_backend')
+    def test_edit_with_synced_fields_queues_backend_sync(self, sync_readers_to_backend):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.change_reader(display_name='Renamed Reader')
+        self.assertEqual(response.status_code, 302)
+        sync_readers_to_backend.delay.assert_called_once_with([self.reader.pk])
+
+    @mock.patch('readers.admin.sync_readers_to_backend')
+    def test_edit_saves_when_broker_is_down(self, sync_readers_to_backend):
+        sync_readers_to_backend.delay.side_effect = OperationalError('broker unavailable')
+        with self.assertLogs('readers.admin', 'ERROR'):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.change_reader(display_name='Renamed Reader')
+        self.assertEqual(response.status_code, 302)
+        self.reader.refresh_from_db()
+        self.assertEqual(self.reader.display_name, 'Renamed Reader')
+
+
+class ProductAdminTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        self.client.force_login(self.admin_user)
+
+    def create_products(self, count):
+        start = Product.objects.count()
+        for i in range(start, start + count):
+            reader = ReaderProfile.objects.create(
+                clerk_id=f'clerk_{i}',
+                email=f'reader{i}@example.com',
+                display_name=f'Reader {i}',
+            )
+            Product.objects.create(
+                name=f'Product {i}',
+                description='Description',
+                product_type='service',
+                price='9.99',
+                reader=reader,
+                stripe_product_id=f'prod_{i}',
+            )
+
+    def test_changelist_query_count_is_constant(self):
+        self.create_products(1)
+        with self.assertNumQueries(4):
+            self.client.get('/admin/readers/product/')
+
+        self.create_products(20)
+        with self.assertNumQueries(4):
+            response = self.client.get('/admin/readers/product/')
+        self.assertContains(response, 'Reader 20')
+
+    def add_product(self, name):
+        return self.client.post('/admin/readers/product/add/', {
+            'name': name,
+            'description': f'{name} description',
+            'product_type': 'physical',
+            'price': '19.99',
+            'is_active': 'on',
+            'images': '["front.jpg"]',
+            'metadata': '{"featured": false}',
+        })
+
+    @mock.patch('readers.admin.create_stripe_product')
+    def test_add_products_before_stripe_sync(self, create_stripe_product):
+        for name in ['Tarot Deck', 'Crystal Set']:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.add_product(name)
+            self.assertEqual(response.status_code, 302)
+
+        self.assertEqual(Product.objects.filter(stripe_product_id__isnull=True).count(), 2)
+        self.assertEqual(create_stripe_product.delay.call_count, 2)
+
+    @mock.patch('readers.admin.create_stripe_product')
+    def test_add_product_when_broker_is_down(self, create_stripe_product):
+        create_stripe_product.delay.side_effect = OperationalError('broker unavailable')
+        with self.assertLogs('readers.admin', 'ERROR'):
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.add_product('Tarot Deck')
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(Product.objects.filter(name='Tarot Deck').exists())
+
+
+class EstimatedCountPaginatorTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        ReaderProfile.objects.bulk_create(
+            ReaderProfile(clerk_id=f'clerk_{i}', email=f'reader{i}@example.com', display_name=f'Reader {i}')
+            for i in range(100)
+        )
+
+    def paginate_with_estimate(self, estimate):
+        connection = mock.MagicMock(vendor='postgresql')
+        connection.cursor.return_value.__enter__.return_value.fetchone.return_value = (estimate,)
+        with mock.patch('readers.paginators.connections', {'default': connection}):
+            paginator = EstimatedCountPaginator(ReaderProfile.objects.order_by('pk'), 50)
+            return paginator.count
+
+    def test_low_estimate_falls_back_to_exact_count(self):
+        self.assertEqual(self.paginate_with_estimate(60), 100)
+
+    def test_unanalyzed_table_falls_back_to_exact_count(self):
+        self.assertEqual(self.paginate_with_estimate(-1), 100)
+
+    def test_large_estimate_is_used(self):
+        self.assertEqual(self.paginate_with_estimate(50_000), 50_000)
+
+    def test_filtered_queryset_uses_exact_count(self):
+        paginator = EstimatedCountPaginator(ReaderProfile.objects.filter(display_name__startswith='Reader 1'), 50)
+        self.assertEqual(paginator.count, 11)
+
+
+class BackendPayloadTests(TestCase):
+
+    def test_decimal_rates_encode_exactly(self):
+        encoded = orjson.dumps({'chat_rate': Decimal('2.99')}, default=_json_default)
+        self.assertEqual(encoded, b'{"chat_rate":2.99}')
+
+    def test_decimal_encoding_skips_float_round_trip(self):
+        encoded = orjson.dumps({'rate': Decimal('0.1000000000000000055511151231257827')}, default=_json_default)
+        self.assertEqual(encoded, b'{"rate":0.1000000000000000055511151231257827}')
+
+    def test_unsupported_type_raises(self):
+        with self.assertRaises(TypeError):
+            orjson.dumps({'value': object()}, default=_json_default)
+
+
+@mock.patch('readers.tasks._CLIENT')
+class SyncReadersToBackendTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.readers = [
+            ReaderProfile.objects.create(clerk_id=f'clerk_{i}', email=f'reader{i}@example.com', display_name=f'Reader {i}')
+            for i in range(2)
+        ]
+        cls.reader_ids = [reader.pk for reader in cls.readers]
+
+    def results_response(self, *results):
+        return httpx.Response(200, content=orjson.dumps({'results': list(results)}))
+
+    def test_posts_readers_in_one_request(self, client):
+        client.post.return_value = self.results_response(
+            {'clerk_id': 'clerk_0', 'success': True},
+            {'clerk_id': 'clerk_1', 'success': True},
+        )
+        with self.assertLogs('readers.tasks', 'INFO') as logs:
+            sync_readers_to_backend.apply(args=[self.reader_ids])
+
+        client.post.assert_called_once()
+        url = client.post.call_args.args[0]
+        payload = orjson.loads(client.post.call_args.kwargs['content'])
+        self.assertTrue(url.endswith('/api/admin/readers/bulk'))
+        self.assertEqual(sorted(r['clerk_id'] for r in payload['readers']), ['clerk_0', 'clerk_1'])
+        self.assertIn('X-Admin-Sync-Secret', client.post.call_args.kwargs['headers'])
+        self.assertEqual(len(logs.records), 2)
+
+    def test_retries_gateway_errors(self, client):
+        client.post.side_effect = [
+            httpx.Response(503),
+            self.results_response({'clerk_id': 'clerk_0', 'success': True}),
+        ]
+        with self.assertLogs('readers.tasks', 'INFO') as logs:
+            sync_readers_to_backend.apply(args=[self.reader_ids[:1]])
+
+        self.assertEqual(client.post.call_count, 2)
+        self.assertIn('Reader clerk_0 synced with backend', logs.output[0])
+
+    def test_logs_permanent_per_reader_failures(self, client):
+        client.post.return_value = self.results_response(
+            {'clerk_id': 'clerk_0', 'success': True},
+            {'clerk_id': 'clerk_1', 'success': False, 'retryable': False, 'error': 'Failed to sync reader account'},
+        )
+        with self.assertLogs('readers.tasks', 'INFO') as logs:
+            result = sync_readers_to_backend.apply(args=[self.reader_ids])
+
+        self.assertTrue(result.successful())
+        client.post.assert_called_once()
+        self.assertIn('ERROR:readers.tasks:Error syncing reader clerk_1 with backend', logs.output)
+        self.assertIn('INFO:readers.tasks:Reader clerk_0 synced with backend', logs.output)
+
+    def test_retries_only_readers_with_retryable_failures(self, client):
+        client.post.side_effect = [
+            self.results_response(
+                {'clerk_id': 'clerk_0', 'success': True},
+                {'clerk_id': 'clerk_1', 'success': False, 'retryable': True, 'error': 'Failed to sync reader account'},
+            ),
+            self.results_response({'clerk_id': 'clerk_1', 'success': True}),
+        ]
+        with self.assertLogs('readers.tasks', 'INFO') as logs:
+            sync_readers_to_backend.apply(args=[self.reader_ids])
+
+        self.assertEqual(client.post.call_count, 2)
+        retried = orjson.loads(client.post.call_args.kwargs['content'])['readers']
+        self.assertEqual([r['clerk_id'] for r in retried], ['clerk_1'])
+        self.assertIn('INFO:readers.tasks:Reader clerk_1 synced with backend', logs.output)
+
+    def test_skips_request_without_readers(self, client):
+        sync_readers_to_backend.apply(args=[[]])
+        client.post.assert_not_called()
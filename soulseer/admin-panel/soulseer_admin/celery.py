@@ -0,0 +1,16 @@
+"""
+Celery application for soulseer_admin project.
+
+Workers are started with:
+    celery -A soulseer_admin worker -l info
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'soulseer_admin.settings')
+
+app = Celery('soulseer_admin')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
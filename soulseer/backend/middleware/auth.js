@@ -1,4 +1,5 @@
 import { ClerkExpressRequireAuth } from '@clerk/clerk-sdk-node';
+import crypto from 'crypto';
 import dotenv from 'dotenv';
 
 dotenv.config();
@@ -57,6 +58,25 @@ export const requireAdmin = requireRole('admin');
 // Check if user is a client or admin
 export const requireClient = requireRole('client', 'admin');
 
+// Shared-secret auth for server-to-server calls from the Django admin panel
+export const requireAdminPanel = (req, res, next) => {
+  const expected = process.env.ADMIN_SYNC_SECRET;
+  const provided = req.get('X-Admin-Sync-Secret');
+
+  if (!expected || !provided) {
+    return res.status(401).json({ error: 'Unauthorized' });
+  }
+
+  const expectedHash = crypto.createHash('sha256').update(expected).digest();
+  const providedHash = crypto.createHash('sha256').update(provided).digest();
+
+  if (!crypto.timingSafeEqual(expectedHash, providedHash)) {
+    return res.status(401).json({ error: 'Unauthorized' });
+  }
+
+  next();
+};
+
 // Optional auth - doesn't fail if not authenticated
 export const optionalAuth = async (req, res, next) => {
   try {
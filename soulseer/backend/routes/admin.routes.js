@@ -1,5 +1,5 @@
 import express from 'express';
-import { requireAuth, requireAdmin } from '../middleware/auth.js';
+import { requireAuth, requireAdmin, requireAdminPanel } from '../middleware/auth.js';
 import { query, transaction } from '../config/database.js';
 import stripeService from '../services/stripe.service.js';
 
@@ -59,6 +59,115 @@ router.post('/readers', async (req, res) => {
   }
 });
 
+// Thrown when a clerk_id already belongs to a client or admin account
+class ReaderRoleConflictError extends Error {}
+
+// Whether a failed reader sync is worth retrying. Role conflicts, bad input
+// (PostgreSQL class 22) and constraint violations (class 23) fail the same way
+// every time; Stripe blips, deadlocks and lost connections don't.
+const isRetryableSyncError = (error) => {
+  if (error instanceof ReaderRoleConflictError) {
+    return false;
+  }
+  if (error.type === 'StripeInvalidRequestError') {
+    return false;
+  }
+  return !(typeof error.code === 'string' && /^2[23]/.test(error.code));
+};
+
+// Create or update reader accounts in bulk (called from Django admin)
+router.post('/readers/bulk', requireAdminPanel, async (req, res) => {
+  const { readers } = req.body;
+
+  if (!Array.isArray(readers)) {
+    return res.status(400).json({ error: 'readers must be an array' });
+  }
+
+  const results = [];
+
+  // Each reader is upserted in its own transaction so one bad row
+  // doesn't roll back the rest of the batch
+  for (const reader of readers) {
+    const {
+      clerk_id,
+      email,
+      display_name,
+      bio,
+      specialties,
+      chat_rate,
+      call_rate,
+      video_rate
+    } = reader;
+
+    try {
+      const created = await transaction(async (client) => {
+        // Existing accounts are only updated if they already belong to a reader
+        const userResult = await client.query(
+          `INSERT INTO users (clerk_id, email, role)
+           VALUES ($1, $2, 'reader')
+           ON CONFLICT (clerk_id)
+           DO UPDATE SET email = EXCLUDED.email, updated_at = CURRENT_TIMESTAMP
+           WHERE users.role = 'reader'
+           RETURNING id`,
+          [clerk_id, email]
+        );
+
+        if (userResult.rowCount === 0) {
+          throw new ReaderRoleConflictError(`User ${clerk_id} exists with a non-reader role`);
+        }
+
+        const userId = userResult.rows[0].id;
+        const profileValues = [userId, display_name, bio, specialties, chat_rate, call_rate, video_rate];
+
+        let profileResult = await client.query(
+          `UPDATE reader_profiles
+           SET display_name = $2, bio = $3, specialties = $4,
+               chat_rate = $5, call_rate = $6, video_rate = $7,
+               updated_at = CURRENT_TIMESTAMP
+           WHERE user_id = $1
+           RETURNING stripe_account_id`,
+          profileValues
+        );
+
+        const isNew = profileResult.rowCount === 0;
+        if (isNew) {
+          profileResult = await client.query(
+            `INSERT INTO reader_profiles
+             (user_id, display_name, bio, specialties, chat_rate, call_rate, video_rate)
+             VALUES ($1, $2, $3, $4, $5, $6, $7)
+             RETURNING stripe_account_id`,
+            profileValues
+          );
+        }
+
+        // Only readers without a Connect account get one created
+        if (!profileResult.rows[0].stripe_account_id) {
+          const stripeAccount = await stripeService.createConnectAccount(userId, email);
+
+          await client.query(
+            'UPDATE reader_profiles SET stripe_account_id = $1 WHERE user_id = $2',
+            [stripeAccount.id, userId]
+          );
+        }
+
+        return isNew;
+      });
+
+      results.push({ clerk_id, success: true, created });
+    } catch (error) {
+      console.error(`Error syncing reader ${clerk_id}:`, error);
+      results.push({
+        clerk_id,
+        success: false,
+        retryable: isRetryableSyncError(error),
+        error: 'Failed to sync reader account'
+      });
+    }
+  }
+
+  res.json({ results });
+});
+
 // Get all users
 router.get('/users', requireAuth, requireAdmin, async (req, res) => {
   try {
@@ -18,6 +18,10 @@ const io = new Server(httpServer, {
 
 // Middleware
 app.use(cors());
+// Bulk reader syncs from the Django admin carry up to 50 readers (bios
+// included), past the default 100 KB limit, so they get a larger one
+// before the global parser sees them
+app.use('/api/admin/readers/bulk', express.json({ limit: '5mb' }));
 app.use(express.json());
 app.use(express.urlencoded({ extended: true }));
 